@@ -5,21 +5,87 @@ Implements POST /v1/audio/transcriptions to allow external tools to use
 the local Whisper model by setting base_url to http://localhost:5000/v1
 """
 
+import base64
 import io
 import json
+import queue
+import quopri
+import tempfile
 import threading
 import time
+from email import policy
+from email.parser import BytesHeaderParser
+from enum import Enum
 from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 
-import numpy as np
 import soundfile as sf
 
+from audio_processing import to_mono_16k
 from utils import ConfigManager
 
+# Read size for streaming request bodies
+CHUNK_SIZE = 64 * 1024
+# Uploaded files larger than this spill from memory to a temporary file
+SPOOL_MAX_SIZE = 8 << 20
+# Upper bound on the header block of a single multipart part
+MAX_PART_HEADER_SIZE = 16 * 1024
+# Seconds a client gets to send the whole request body. The per-read socket
+# timeout alone lets a client that trickles bytes hold a worker forever.
+BODY_READ_DEADLINE = 300
+
+_header_parser = BytesHeaderParser(policy=policy.HTTP)
+
+# Shared compact encoder. ensure_ascii (the default) keeps the output ASCII,
+# so it can be encoded without a UTF-8 pass.
+_json_encode = json.JSONEncoder(separators=(',', ':')).encode
+
+# The Whisper model is shared by all handler threads. Concurrent transcribe()
+# calls on one model only compete for memory and compute, so run them in turn.
+_transcribe_lock = threading.Lock()
+
+
+class _State(Enum):
+    """States of the streaming multipart parser."""
+    PREAMBLE = 1
+    BOUNDARY = 2
+    HEADERS = 3
+    BODY = 4
+    DONE = 5
+
+
+class _DeadlineReader:
+    """
+    Wrap a request body stream so every read must finish before a deadline.
+
+    Before each read the socket timeout is lowered to the time left, so a
+    read that would run past the deadline raises TimeoutError.
+    """
+
+    def __init__(self, stream, connection, read_timeout, deadline):
+        self.stream = stream
+        self.connection = connection
+        self.read_timeout = read_timeout
+        self.deadline = deadline
+
+    def readinto(self, buffer):
+        time_left = self.deadline - time.monotonic()
+        if time_left <= 0:
+            raise TimeoutError('Request body not received in time')
+        self.connection.settimeout(min(self.read_timeout, time_left))
+        return self.stream.readinto(buffer)
+
 
 class TranscriptionHandler(BaseHTTPRequestHandler):
     """HTTP request handler for OpenAI-compatible transcription API."""
 
+    # Buffer writes so headers and body leave in a single send() when the
+    # handler flushes at the end of the request
+    wbufsize = io.DEFAULT_BUFFER_SIZE
+
+    # Socket read timeout in seconds. Each connection holds a pool worker, so a
+    # client that connects and then goes quiet must not hold it forever.
+    timeout = 30
+
     def __init__(self, *args, local_model=None, **kwargs):
         self.local_model = local_model
         super().__init__(*args, **kwargs)
@@ -30,10 +96,12 @@ class TranscriptionHandler(BaseHTTPRequestHandler):
 
     def send_json_response(self, data, status=200):
         """Send a JSON response."""
-        response = json.dumps(data).encode('utf-8')
+        response = _json_encode(data).encode('ascii')
         self.send_response(status)
         self.send_header('Content-Type', 'application/json')
         self.send_header('Content-Length', len(response))
+        # The server speaks HTTP/1.0 and closes the connection after every response
+        self.send_header('Connection', 'close')
         self.end_headers()
         self.wfile.write(response)
 
@@ -86,17 +154,20 @@ class TranscriptionHandler(BaseHTTPRequestHandler):
             self.send_error_response('Content-Type must be multipart/form-data')
             return
 
+        local_options = ConfigManager.get_config_section('model_options').get('local', {})
+
+        form_data = {}
         try:
             content_length = int(self.headers.get('Content-Length', 0))
-            body = self.rfile.read(content_length)
+            body = _DeadlineReader(self.rfile, self.connection, self.timeout,
+                                   time.monotonic() + BODY_READ_DEADLINE)
+            form_data = self.parse_multipart(body, content_length, content_type)
 
-            form_data = self.parse_multipart(body, content_type)
-
-            if 'file' not in form_data:
+            if 'file' not in form_data or isinstance(form_data['file'], str):
                 self.send_error_response('Missing required field: file')
                 return
 
-            audio_bytes = form_data['file']
+            audio_file = form_data['file']
             language = form_data.get('language')
             prompt = form_data.get('prompt')
             temperature = form_data.get('temperature')
@@ -107,24 +178,10 @@ class TranscriptionHandler(BaseHTTPRequestHandler):
                 except ValueError:
                     temperature = None
 
-            audio_data, sample_rate = sf.read(io.BytesIO(audio_bytes))
-
-            if len(audio_data.shape) > 1:
-                audio_data = audio_data.mean(axis=1)
-
-            # Resample to 16kHz if needed (Whisper expects 16kHz)
-            if sample_rate != 16000:
-                duration = len(audio_data) / sample_rate
-                target_length = int(duration * 16000)
-                audio_data = np.interp(
-                    np.linspace(0, len(audio_data), target_length),
-                    np.arange(len(audio_data)),
-                    audio_data
-                )
-
-            audio_data = audio_data.astype(np.float32)
+            audio_data, sample_rate = sf.read(audio_file, dtype='float32', always_2d=True)
 
-            local_options = ConfigManager.get_config_section('model_options').get('local', {})
+            # Whisper expects mono 16kHz audio
+            audio_data = to_mono_16k(audio_data, sample_rate)
 
             transcribe_kwargs = {
                 'audio': audio_data,
@@ -141,21 +198,37 @@ class TranscriptionHandler(BaseHTTPRequestHandler):
             ConfigManager.console_print(f'API: Received audio. Duration: {duration:.2f} seconds')
             ConfigManager.console_print('Transcribing...')
 
-            start_time = time.time()
-            segments, info = self.local_model.transcribe(**transcribe_kwargs)
-            text = ''.join([segment.text for segment in segments])
-            elapsed = time.time() - start_time
+            with _transcribe_lock:
+                start_time = time.time()
+                segments, info = self.local_model.transcribe(**transcribe_kwargs)
+                text = ''.join(segment.text for segment in segments)
+                elapsed = time.time() - start_time
 
             ConfigManager.console_print(f'Transcription completed in {elapsed:.2f} seconds. Result: {text.strip()}')
 
             self.send_json_response({'text': text.strip()})
 
+        except TimeoutError as e:
+            ConfigManager.console_print(f'API upload timed out: {e}')
+            # The deadline may have left the socket timeout near zero
+            self.connection.settimeout(self.timeout)
+            self.send_error_response('Request body not received in time', 408)
         except Exception as e:
             ConfigManager.console_print(f'API transcription error: {e}')
             self.send_error_response(f'Transcription failed: {str(e)}', 500)
-
-    def parse_multipart(self, body, content_type):
-        """Parse multipart/form-data manually (no cgi module needed)."""
+        finally:
+            for value in form_data.values():
+                if not isinstance(value, str):
+                    value.close()
+
+    def parse_multipart(self, stream, content_length, content_type):
+        """
+        Parse a multipart/form-data body straight from the request stream.
+
+        The body is consumed in CHUNK_SIZE reads, so it is never held in memory
+        as a whole. File parts are written to a SpooledTemporaryFile (rewound
+        and ready to read); regular fields are returned as stripped strings.
+        """
         boundary = None
         for part in content_type.split(';'):
             part = part.strip()
@@ -166,55 +239,200 @@ class TranscriptionHandler(BaseHTTPRequestHandler):
         if not boundary:
             raise ValueError('No boundary found in Content-Type')
 
-        boundary_bytes = ('--' + boundary).encode()
-        end_boundary = ('--' + boundary + '--').encode()
+        # Every delimiter is preceded by CRLF, except the first one which may
+        # start the body. Seeding the buffer with CRLF makes them uniform.
+        delimiter = ('\r\n--' + boundary).encode()
+        keep = len(delimiter) - 1
 
-        parts = body.split(boundary_bytes)
         result = {}
+        buf = bytearray(b'\r\n')
+        chunk = bytearray(CHUNK_SIZE)
+        chunk_view = memoryview(chunk)
+        remaining = content_length
+        state = _State.PREAMBLE
+        name = None
+        is_file = False
+        encoding = None
+        sink = None
 
-        for part in parts:
-            if not part or part == b'--\r\n' or part.strip() == b'--':
-                continue
+        try:
+            while state is not _State.DONE:
+                need_more = False
+
+                if state is _State.PREAMBLE:
+                    idx = buf.find(delimiter)
+                    if idx < 0:
+                        del buf[:max(len(buf) - keep, 0)]
+                        need_more = True
+                    else:
+                        del buf[:idx + len(delimiter)]
+                        state = _State.BOUNDARY
+
+                elif state is _State.BOUNDARY:
+                    if buf.startswith(b'--'):
+                        state = _State.DONE
+                        continue
+                    idx = buf.find(b'\r\n')
+                    if idx < 0:
+                        need_more = True
+                    else:
+                        del buf[:idx + 2]
+                        state = _State.HEADERS
+
+                elif state is _State.HEADERS:
+                    idx = buf.find(b'\r\n\r\n')
+                    if idx < 0:
+                        if len(buf) > MAX_PART_HEADER_SIZE:
+                            raise ValueError('Multipart part headers too large')
+                        need_more = True
+                    else:
+                        name, is_file, encoding = self._parse_part_headers(bytes(buf[:idx]))
+                        del buf[:idx + 4]
+                        if is_file:
+                            sink = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_SIZE)
+                        else:
+                            sink = io.BytesIO()
+                        state = _State.BODY
+
+                elif state is _State.BODY:
+                    idx = buf.find(delimiter)
+                    end = max(len(buf) - keep, 0) if idx < 0 else idx
+                    # Write through a view so part data is not copied into
+                    # an intermediate bytes object first
+                    with memoryview(buf)[:end] as view:
+                        sink.write(view)
+                    if idx < 0:
+                        del buf[:end]
+                        need_more = True
+                    else:
+                        del buf[:idx + len(delimiter)]
+                        self._store_part(result, name, sink, is_file, encoding)
+                        sink = None
+                        state = _State.BOUNDARY
+
+                if need_more:
+                    n = stream.readinto(chunk_view[:min(CHUNK_SIZE, remaining)]) if remaining > 0 else 0
+                    if not n:
+                        if state is _State.PREAMBLE:
+                            break
+                        raise ValueError('Unexpected end of multipart body')
+                    remaining -= n
+                    buf += chunk_view[:n]
+        except Exception:
+            if sink is not None:
+                sink.close()
+            for value in result.values():
+                if not isinstance(value, str):
+                    value.close()
+            raise
 
-            if part.startswith(b'\r\n'):
-                part = part[2:]
-            if part.endswith(b'\r\n'):
-                part = part[:-2]
+        return result
 
-            if b'\r\n\r\n' not in part:
-                continue
+    @staticmethod
+    def _parse_part_headers(header_bytes):
+        """
+        Return (name, is_file, transfer_encoding) for a part.
 
-            header_section, content = part.split(b'\r\n\r\n', 1)
-            headers = header_section.decode('utf-8', errors='replace')
+        Headers are parsed by the email package, which handles quoted and
+        RFC 2231 encoded Content-Disposition parameters.
+        """
+        headers = _header_parser.parsebytes(header_bytes)
 
-            name = None
-            is_file = False
+        disposition = headers['content-disposition']
+        params = disposition.params if disposition else {}
+        encoding = (headers['content-transfer-encoding'] or '').strip().lower()
 
-            for line in headers.split('\r\n'):
-                if line.lower().startswith('content-disposition:'):
-                    for item in line.split(';'):
-                        item = item.strip()
-                        if item.startswith('name='):
-                            name = item[5:].strip('"')
-                        if item.startswith('filename='):
-                            is_file = True
+        return params.get('name'), 'filename' in params, encoding
 
-            if name:
-                if is_file:
-                    result[name] = content
-                else:
-                    result[name] = content.decode('utf-8', errors='replace').strip()
+    @staticmethod
+    def _store_part(result, name, sink, is_file, encoding=None):
+        """Move a finished part into the result dict, or discard it if unnamed."""
+        if not name:
+            sink.close()
+            return
 
-        return result
+        previous = result.get(name)
+        if previous is not None and not isinstance(previous, str):
+            previous.close()
+
+        sink.seek(0)
+        if encoding in ('base64', 'quoted-printable'):
+            decoded = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_SIZE) if is_file else io.BytesIO()
+            try:
+                if encoding == 'base64':
+                    base64.decode(sink, decoded)
+                else:
+                    quopri.decode(sink, decoded)
+            except Exception:
+                decoded.close()
+                raise
+            finally:
+                sink.close()
+            decoded.seek(0)
+            sink = decoded
+
+        if is_file:
+            result[name] = sink
+        else:
+            result[name] = sink.read().decode('utf-8', errors='replace').strip()
+            sink.close()
+
+
+class PooledHTTPServer(ThreadingHTTPServer):
+    """
+    ThreadingHTTPServer that handles connections on a bounded thread pool.
+
+    ThreadingHTTPServer starts a new thread per connection, so a burst of
+    requests would run that many transcriptions side by side. Here at most
+    max_workers requests are handled at once and the rest wait their turn.
+    """
+
+    def __init__(self, server_address, RequestHandlerClass, max_workers=2):
+        super().__init__(server_address, RequestHandlerClass)
+        self._requests = queue.SimpleQueue()
+        # Daemon workers, like ThreadingHTTPServer's daemon_threads, so a
+        # request still in progress never keeps the app from exiting
+        self._workers = [
+            threading.Thread(target=self._worker, name=f'api-server-{i}', daemon=True)
+            for i in range(max_workers)
+        ]
+        for worker in self._workers:
+            worker.start()
+
+    def _worker(self):
+        """Handle queued requests until a None sentinel arrives."""
+        while True:
+            item = self._requests.get()
+            if item is None:
+                return
+            self.process_request_thread(*item)
+
+    def process_request(self, request, client_address):
+        """Queue the request for the pool instead of starting a new thread."""
+        self._requests.put((request, client_address))
+
+    def server_close(self):
+        """Close the listening socket, close queued requests and stop the workers."""
+        super().server_close()
+        while True:
+            try:
+                item = self._requests.get_nowait()
+            except queue.Empty:
+                break
+            if item is not None:
+                self.shutdown_request(item[0])
+        for _ in self._workers:
+            self._requests.put(None)
 
 
 class APIServer:
     """Manages the HTTP API server lifecycle."""
 
-    def __init__(self, local_model, host='127.0.0.1', port=5000):
+    def __init__(self, local_model, host='127.0.0.1', port=5000, max_workers=2):
         self.local_model = local_model
         self.host = host
         self.port = port
+        self.max_workers = max_workers
         self.server = None
         self.thread = None
 
@@ -227,7 +445,8 @@ class APIServer:
             return TranscriptionHandler(*args, local_model=self.local_model, **kwargs)
 
         try:
-            self.server = ThreadingHTTPServer((self.host, self.port), handler)
+            self.server = PooledHTTPServer((self.host, self.port), handler,
+                                           max_workers=self.max_workers)
             self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
             self.thread.start()
             ConfigManager.console_print(f'API server started at http://{self.host}:{self.port}')
@@ -239,6 +458,7 @@ class APIServer:
         """Stop the API server."""
         if self.server:
             self.server.shutdown()
+            self.server.server_close()
             self.server = None
             self.thread = None
             ConfigManager.console_print('API server stopped')
@@ -0,0 +1,104 @@
+"""
+Audio preprocessing helpers shared by the API server and the model benchmark.
+
+Whisper expects mono float32 audio at 16kHz. to_mono_16k converts decoded
+audio of any channel count and sample rate to that format in one compiled call.
+"""
+
+import functools
+import math
+
+import numpy as np
+
+WHISPER_SAMPLE_RATE = 16000
+
+
+@functools.lru_cache(maxsize=16)
+def _resample_filter(sample_rate):
+    """
+    Design the anti-aliasing FIR for resampling sample_rate to 16kHz.
+
+    This is the same Kaiser-windowed filter scipy's resample_poly designs by
+    default, built once per sample rate. Audio that is already at 16kHz gets
+    a single unit tap, which reduces the kernel to a plain mono mix.
+    """
+    if sample_rate == WHISPER_SAMPLE_RATE:
+        taps = np.ones(1, dtype=np.float32)
+    else:
+        g = math.gcd(sample_rate, WHISPER_SAMPLE_RATE)
+        max_rate = max(WHISPER_SAMPLE_RATE // g, sample_rate // g)
+        half_len = 10 * max_rate
+        # Imported here so loading this module doesn't pull in scipy.signal
+        from scipy.signal import firwin
+        taps = firwin(2 * half_len + 1, 1.0 / max_rate, window=('kaiser', 5.0)).astype(np.float32)
+    taps.setflags(write=False)
+    return taps
+
+
+def _mix_and_resample(frames, taps, up, down, n_out):
+    """
+    Mix frames down to mono and resample by up/down with polyphase filtering.
+
+    Equivalent to resample_poly(frames.mean(axis=1), up, down, window=taps).
+    Each input frame is mixed to mono once, then every output sample is
+    filtered straight from the mono signal, so the upsampled array
+    resample_poly works on is never allocated.
+    """
+    n_in, channels = frames.shape
+    n_taps = taps.shape[0]
+    half_len = (n_taps - 1) // 2
+    scale = np.float32(up / channels)
+
+    mono = np.empty(n_in, dtype=np.float32)
+    for i in range(n_in):
+        sample = np.float32(0.0)
+        for c in range(channels):
+            sample += frames[i, c]
+        mono[i] = sample
+
+    out = np.empty(n_out, dtype=np.float32)
+
+    # Serial on purpose: the API workers and the benchmark thread call this
+    # concurrently, which not every numba threading layer allows, and a
+    # per-call thread pool would oversubscribe the cores anyway
+    for m in range(n_out):
+        # Position of this output sample on the upsampled grid, shifted by the
+        # filter delay so the output lines up with the input
+        t = m * down + half_len
+        first = max(0, (t - n_taps + up) // up)
+        last = min(n_in - 1, t // up)
+
+        acc = np.float32(0.0)
+        for i in range(first, last + 1):
+            acc += taps[t - i * up] * mono[i]
+        out[m] = acc * scale
+
+    return out
+
+
+@functools.lru_cache(maxsize=1)
+def _compiled_kernel():
+    """
+    Compile _mix_and_resample on first use, so importing numba is deferred too.
+
+    The kernel releases the GIL, so the Qt UI and the other API worker keep
+    running while an upload is resampled.
+    """
+    from numba import njit
+    return njit(nogil=True, fastmath=True, cache=True)(_mix_and_resample)
+
+
+def to_mono_16k(frames, sample_rate):
+    """
+    Convert a (frames, channels) array at sample_rate to mono float32 at 16kHz.
+    """
+    frames = np.ascontiguousarray(frames, dtype=np.float32)
+    if frames.ndim == 1:
+        frames = frames[:, np.newaxis]
+
+    g = math.gcd(sample_rate, WHISPER_SAMPLE_RATE)
+    up = WHISPER_SAMPLE_RATE // g
+    down = sample_rate // g
+    n_out = -(-len(frames) * up // down)
+
+    return _compiled_kernel()(frames, _resample_filter(sample_rate), up, down, n_out)
@@ -83,7 +83,13 @@ class ScreamScriberApp(QObject):
 
         host = api_config.get('host', '127.0.0.1')
         port = api_config.get('port', 5000)
-        self.api_server = APIServer(self.local_model, host=host, port=port)
+        max_workers = api_config.get('max_workers')
+        if max_workers is None:
+            max_workers = 2
+        elif max_workers < 1:
+            ConfigManager.console_print(f'API server max_workers must be at least 1 (got {max_workers}), using 1')
+            max_workers = 1
+        self.api_server = APIServer(self.local_model, host=host, port=port, max_workers=max_workers)
         self.api_server.start()
 
     def create_tray_icon(self):
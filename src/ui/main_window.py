@@ -28,7 +28,7 @@ class MainWindow(BaseWindow):
         image_label = QLabel()
         image_label.setAlignment(Qt.AlignCenter)
         pixmap = QPixmap(os.path.join('assets', 'boyandbot.png'))
-        pixmap = pixmap.scaled(313, 227, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+        pixmap = pixmap.scaled(313, 227, Qt.KeepAspectRatio, Qt.FastTransformation)
         image_label.setPixmap(pixmap)
 
         self.main_layout.addStretch(1)
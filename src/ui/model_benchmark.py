@@ -3,32 +3,45 @@ import gc
 import time
 import html
 import tempfile
+import threading
 import webbrowser
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
 from PyQt5.QtWidgets import QTextEdit, QPushButton
-from PyQt5.QtCore import QThread, pyqtSignal
+from PyQt5.QtCore import QThread, QTimer, pyqtSignal
 from PyQt5.QtGui import QFont, QTextCursor
 
 from ui.base_window import BaseWindow
 
 AUDIO_EXTENSIONS = {'.wav', '.mp3', '.flac', '.ogg', '.m4a'}
 
+# Files decoded at once before the benchmark starts. Transcriptions are
+# always timed one file at a time so every model is measured the same way.
+PARALLEL_DECODES = 2
 
-def get_audio_duration(file_path):
-    """Get audio file duration in seconds."""
+
+def load_audio(file_path):
+    """
+    Decode an audio file to mono float32 samples at 16kHz.
+
+    Returns (samples, duration in seconds). The duration is read from the
+    same open file as the samples.
+    """
     try:
         import soundfile as sf
-        info = sf.info(file_path)
-        return info.duration
+        from audio_processing import to_mono_16k
+        with sf.SoundFile(file_path) as f:
+            sample_rate = f.samplerate
+            duration = f.frames / sample_rate
+            frames = f.read(dtype='float32', always_2d=True)
+        return to_mono_16k(frames, sample_rate), duration
     except Exception:
         pass
-    try:
-        import av
-        with av.open(file_path) as container:
-            return float(container.duration) / 1_000_000
-    except Exception:
-        return None
+    # Formats libsndfile can't read (e.g. m4a) go through faster-whisper's decoder
+    from faster_whisper.audio import decode_audio
+    samples = decode_audio(file_path, sampling_rate=16000)
+    return samples, len(samples) / 16000
 
 
 def discover_audio_files(directory):
@@ -53,33 +66,56 @@ class ModelBenchmarkThread(QThread):
         self.audio_files = audio_files
         self.device = device
         self.compute_type = compute_type
-        self._cancelled = False
+        # Roughly one thread per physical core. Letting every model spawn a
+        # thread per logical CPU oversubscribes the cores and skews timings.
+        self.cpu_threads = max(1, (os.cpu_count() or 2) // 2)
+        self._cancel_event = threading.Event()
 
     def cancel(self):
-        self._cancelled = True
+        self._cancel_event.set()
 
     def run(self):
         from faster_whisper import WhisperModel
 
-        # Pre-compute audio durations
+        # Decode every file once, so each model transcribes the same samples
+        # without re-reading the file
         durations = {}
-        for path in self.audio_files:
-            name = os.path.basename(path)
-            dur = get_audio_duration(path)
-            durations[name] = dur
-            if dur:
-                self.log.emit(f"Found: {name} ({dur:.2f}s)")
-            else:
-                self.log.emit(f"Found: {name} (duration unknown)")
-
-        self.log.emit(f"\nDevice: {self.device} | Compute: {self.compute_type}")
+        decoded = {}
+        pool = ThreadPoolExecutor(max_workers=PARALLEL_DECODES)
+        try:
+            loads = [(path, pool.submit(load_audio, path)) for path in self.audio_files]
+            for path, future in loads:
+                if self._cancel_event.is_set():
+                    self.log.emit("\nBenchmark cancelled.")
+                    return
+
+                name = os.path.basename(path)
+                try:
+                    decoded[path], dur = future.result()
+                except Exception as e:
+                    dur = None
+                    self.log.emit(f"Could not decode {name} up front ({e})")
+                durations[name] = dur
+                if dur:
+                    self.log.emit(f"Found: {name} ({dur:.2f}s)")
+                else:
+                    self.log.emit(f"Found: {name} (duration unknown)")
+        finally:
+            # On cancel, drop the files not yet decoding and don't wait for
+            # the ones in progress
+            pool.shutdown(wait=False, cancel_futures=True)
+
+        self.log.emit(
+            f"\nDevice: {self.device} | Compute: {self.compute_type}"
+            f" | CPU threads: {self.cpu_threads}"
+        )
         self.log.emit(f"Models to test: {len(self.models)} | Samples: {len(self.audio_files)}\n")
 
         results = {}
         load_times = {}
 
         for i, model_name in enumerate(self.models):
-            if self._cancelled:
+            if self._cancel_event.is_set():
                 self.log.emit("\nBenchmark cancelled.")
                 return
 
@@ -88,7 +124,8 @@ class ModelBenchmarkThread(QThread):
             try:
                 t0 = time.time()
                 model = WhisperModel(
-                    model_name, device=self.device, compute_type=self.compute_type
+                    model_name, device=self.device, compute_type=self.compute_type,
+                    cpu_threads=self.cpu_threads
                 )
                 load_time = time.time() - t0
                 load_times[model_name] = load_time
@@ -98,7 +135,8 @@ class ModelBenchmarkThread(QThread):
                 try:
                     t0 = time.time()
                     model = WhisperModel(
-                        model_name, device="cpu", compute_type=self.compute_type
+                        model_name, device="cpu", compute_type=self.compute_type,
+                        cpu_threads=self.cpu_threads
                     )
                     load_time = time.time() - t0
                     load_times[model_name] = load_time
@@ -110,20 +148,18 @@ class ModelBenchmarkThread(QThread):
             results[model_name] = {}
 
             for path in self.audio_files:
-                if self._cancelled:
+                if self._cancel_event.is_set():
                     break
 
                 name = os.path.basename(path)
                 self.log.emit(f"  {name}...")
 
                 try:
-                    t0 = time.time()
-                    segments, info = model.transcribe(path)
-                    text = "".join(seg.text for seg in segments)
-                    elapsed = time.time() - t0
+                    text, info, elapsed = self._transcribe(model, decoded.get(path, path))
 
-                    dur = durations.get(name) or info.duration
-                    if dur and not durations.get(name):
+                    dur = durations.get(name)
+                    if dur is None:
+                        dur = info.duration
                         durations[name] = dur
                     rtf = dur / elapsed if dur and elapsed > 0 else 0
 
@@ -153,15 +189,12 @@ class ModelBenchmarkThread(QThread):
                 pass
 
             # Wait 3 seconds before next model
-            if i < len(self.models) - 1 and not self._cancelled:
+            if i < len(self.models) - 1 and not self._cancel_event.is_set():
                 self.log.emit("  Cooling down (3s)...")
-                for _ in range(30):
-                    if self._cancelled:
-                        break
-                    time.sleep(0.1)
+                self._cancel_event.wait(3.0)
                 self.log.emit("")
 
-        if self._cancelled:
+        if self._cancel_event.is_set():
             self.log.emit("\nBenchmark cancelled.")
             return
 
@@ -178,9 +211,28 @@ class ModelBenchmarkThread(QThread):
         self.log.emit(f"Report: {tmp.name}")
         self.finished.emit(tmp.name)
 
+    def _transcribe(self, model, audio):
+        """Transcribe a sample array or file, returning (text, info, elapsed seconds)."""
+        t0 = time.time()
+        segments, info = model.transcribe(audio)
+        text = "".join(seg.text for seg in segments)
+        return text, info, time.time() - t0
+
+    @staticmethod
+    def _speed_cell(r):
+        """Render one speed table cell, colored by realtime factor."""
+        if not r or r['time'] <= 0:
+            return '<td>N/A</td>'
+        rtf = r['rtf']
+        css = 'fast' if rtf >= 15 else ('medium' if rtf >= 5 else 'slow')
+        tip = html.escape(r['text'])
+        return f'<td class="{css}" title="{tip}">{r["time"]:.2f}s ({rtf:.1f}x)</td>'
+
     def _generate_html(self, results, durations, load_times):
         audio_names = [os.path.basename(p) for p in self.audio_files]
         models = list(results.keys())
+        escaped_models = [html.escape(m) for m in models]
+        escaped_names = [html.escape(af) for af in audio_names]
         now = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
 
         h = []
@@ -220,66 +272,52 @@ class ModelBenchmarkThread(QThread):
         h.append(
             f'<p class="meta">{now} &middot; Device: {html.escape(self.device)}'
             f' &middot; Compute: {html.escape(self.compute_type)}'
+            f' &middot; {self.cpu_threads} CPU threads'
             f' &middot; {len(models)} models'
             f' &middot; {len(audio_names)} samples</p>'
         )
 
         # --- Speed table ---
-        h.append('<h2>Speed</h2>\n<table>\n<tr><th>Sample</th><th>Duration</th>')
-        for m in models:
+        h.append('<h2>Speed</h2>\n<table>')
+        row = ['<tr><th>Sample</th><th>Duration</th>']
+        for m, em in zip(models, escaped_models):
             lt = load_times.get(m)
             lt_str = f'<small>loaded in {lt:.1f}s</small>' if lt else ''
-            h.append(f'<th>{html.escape(m)}{lt_str}</th>')
-        h.append('</tr>')
-
-        avg_rtfs = {m: [] for m in models}
+            row.append(f'<th>{em}{lt_str}</th>')
+        row.append('</tr>')
+        h.append(''.join(row))
 
-        for af in audio_names:
+        for af, ea in zip(audio_names, escaped_names):
             dur = durations.get(af)
             dur_str = f'{dur:.2f}s' if dur else '?'
+            cells = ''.join(self._speed_cell(results[m].get(af)) for m in models)
             h.append(
-                f'<tr><td>{html.escape(af)}</td>'
-                f'<td class="duration">{dur_str}</td>'
+                f'<tr><td>{ea}</td>'
+                f'<td class="duration">{dur_str}</td>{cells}</tr>'
             )
-            for m in models:
-                r = results.get(m, {}).get(af)
-                if r and r['time'] > 0:
-                    rtf = r['rtf']
-                    avg_rtfs[m].append(rtf)
-                    css = 'fast' if rtf >= 15 else ('medium' if rtf >= 5 else 'slow')
-                    tip = html.escape(r['text'])
-                    h.append(
-                        f'<td class="{css}" title="{tip}">'
-                        f'{r["time"]:.2f}s ({rtf:.1f}x)</td>'
-                    )
-                else:
-                    h.append('<td>N/A</td>')
-            h.append('</tr>')
 
         # Average row
-        h.append('<tr class="avg-row"><td>Average</td><td></td>')
-        for m in models:
-            vals = avg_rtfs[m]
-            if vals:
-                avg = sum(vals) / len(vals)
-                h.append(f'<td>{avg:.1f}x</td>')
-            else:
-                h.append('<td>N/A</td>')
-        h.append('</tr>\n</table>')
+        avg_rtfs = [
+            [r['rtf'] for r in results[m].values() if r['time'] > 0]
+            for m in models
+        ]
+        cells = ''.join(
+            f'<td>{sum(vals) / len(vals):.1f}x</td>' if vals else '<td>N/A</td>'
+            for vals in avg_rtfs
+        )
+        h.append(f'<tr class="avg-row"><td>Average</td><td></td>{cells}</tr>\n</table>')
 
         # --- Output table ---
-        h.append('<h2>Output</h2>\n<table>\n<tr><th>Sample</th>')
-        for m in models:
-            h.append(f'<th>{html.escape(m)}</th>')
-        h.append('</tr>')
-
-        for af in audio_names:
-            h.append(f'<tr><td>{html.escape(af)}</td>')
-            for m in models:
-                r = results.get(m, {}).get(af)
-                text = html.escape(r['text']) if r else 'N/A'
-                h.append(f'<td class="output-cell">{text}</td>')
-            h.append('</tr>')
+        h.append('<h2>Output</h2>\n<table>')
+        header = ''.join(f'<th>{em}</th>' for em in escaped_models)
+        h.append(f'<tr><th>Sample</th>{header}</tr>')
+
+        for af, ea in zip(audio_names, escaped_names):
+            cells = ''.join(
+                f'<td class="output-cell">{html.escape(r["text"]) if r else "N/A"}</td>'
+                for r in (results[m].get(af) for m in models)
+            )
+            h.append(f'<tr><td>{ea}</td>{cells}</tr>')
 
         h.append('</table>\n</body>\n</html>')
         return '\n'.join(h)
@@ -305,12 +343,33 @@ class BenchmarkProgressWindow(BaseWindow):
         )
         self.main_layout.addWidget(self.log_area)
 
+        # Log lines are buffered and written in one batch every 50 ms
+        self._pending_log = []
+        self._log_timer = QTimer(self)
+        self._log_timer.setSingleShot(True)
+        self._log_timer.setInterval(50)
+        self._log_timer.timeout.connect(self._flush_log)
+
         self.cancel_btn = QPushButton("Cancel")
         self.cancel_btn.clicked.connect(self._on_cancel)
         self.main_layout.addWidget(self.cancel_btn)
 
     def append_log(self, text):
-        self.log_area.append(text)
+        self._pending_log.append(text)
+        if not self._log_timer.isActive():
+            self._log_timer.start()
+
+    def _flush_log(self):
+        if not self._pending_log:
+            return
+        text = '\n'.join(self._pending_log)
+        self._pending_log.clear()
+
+        cursor = QTextCursor(self.log_area.document())
+        cursor.movePosition(QTextCursor.End)
+        if not self.log_area.document().isEmpty():
+            text = '\n' + text
+        cursor.insertText(text)
         self.log_area.moveCursor(QTextCursor.End)
 
     def _on_cancel(self):
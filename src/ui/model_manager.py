@@ -1,33 +1,126 @@
 import os
 import shutil
 from PyQt5.QtWidgets import (
-    QWidget, QVBoxLayout, QHBoxLayout, QTableWidget, QTableWidgetItem, 
+    QWidget, QVBoxLayout, QHBoxLayout, QTableView,
     QPushButton, QLabel, QHeaderView, QMessageBox, QProgressBar, QFrame
 )
-from PyQt5.QtCore import Qt, QThread, pyqtSignal, QDir
-from PyQt5.QtGui import QFont
+from PyQt5.QtCore import Qt, QThread, QTimer, pyqtSignal, QDir, QAbstractTableModel, QModelIndex
+from PyQt5.QtGui import QFont, QBrush
 import subprocess
 import sys
 
 from ui.base_window import BaseWindow
 from utils import ConfigManager
 
+_AVAILABLE_MODELS = (
+    "tiny", "tiny.en", "base", "base.en", "small", "small.en",
+    "medium", "medium.en", "large", "large-v1", "large-v2", "large-v3",
+    "large-v3-turbo", "distil-large-v2", "distil-large-v3"
+)
+
+# Approximate model sizes in MB
+_MODEL_SIZES = {
+    "tiny": 39,
+    "tiny.en": 39,
+    "base": 74,
+    "base.en": 74,
+    "small": 244,
+    "small.en": 244,
+    "medium": 769,
+    "medium.en": 769,
+    "large": 1550,
+    "large-v1": 1550,
+    "large-v2": 1550,
+    "large-v3": 1550,
+    "large-v3-turbo": 1620,
+    "distil-large-v2": 775,
+    "distil-large-v3": 775
+}
+
+# Model names mapped to their folder names in the HuggingFace cache
+_FOLDER_PATTERNS = {
+    "tiny": "models--Systran--faster-whisper-tiny",
+    "tiny.en": "models--Systran--faster-whisper-tiny.en",
+    "base": "models--Systran--faster-whisper-base",
+    "base.en": "models--Systran--faster-whisper-base.en",
+    "small": "models--Systran--faster-whisper-small",
+    "small.en": "models--Systran--faster-whisper-small.en",
+    "medium": "models--Systran--faster-whisper-medium",
+    "medium.en": "models--Systran--faster-whisper-medium.en",
+    "large": "models--Systran--faster-whisper-large",
+    "large-v1": "models--Systran--faster-whisper-large-v1",
+    "large-v2": "models--Systran--faster-whisper-large-v2",
+    "large-v3": "models--Systran--faster-whisper-large-v3",
+    "large-v3-turbo": "models--mobiuslabsgmbh--faster-whisper-large-v3-turbo",
+    "distil-large-v2": "models--Systran--faster-distil-whisper-large-v2",
+    "distil-large-v3": "models--Systran--faster-distil-whisper-large-v3"
+}
+
+
+def _dir_size(path):
+    """Total size in bytes of the files under path, without following symlinks."""
+    total = 0
+    stack = [path]
+    while stack:
+        try:
+            it = os.scandir(stack.pop())
+        except OSError:
+            continue
+        with it:
+            for entry in it:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    else:
+                        total += entry.stat(follow_symlinks=False).st_size
+                except OSError:
+                    pass
+    return total
+
+
+def _has_model_file(model_dir):
+    """Check whether any snapshot of a hub model folder holds a .bin/.safetensors file."""
+    try:
+        with os.scandir(os.path.join(model_dir, 'snapshots')) as snapshots:
+            for snapshot in snapshots:
+                if not snapshot.is_dir():
+                    continue
+                with os.scandir(snapshot.path) as files:
+                    for f in files:
+                        if f.name.endswith(('.bin', '.safetensors')):
+                            return True
+    except OSError:
+        pass
+    return False
+
 
 class ModelDownloadThread(QThread):
     """Thread for downloading models to avoid blocking the UI."""
     progress = pyqtSignal(str)
     finished = pyqtSignal(bool, str)  # success, message
+
+    # faster_whisper's WhisperModel, imported by the first download
+    _whisper_model = None
     
     def __init__(self, model_name):
         super().__init__()
         self.model_name = model_name
+
+    @classmethod
+    def _load_whisper_model(cls):
+        """Import WhisperModel once, on the download thread rather than the UI thread."""
+        if cls._whisper_model is None:
+            from faster_whisper import WhisperModel
+            cls._whisper_model = WhisperModel
+        return cls._whisper_model
         
     def run(self):
         try:
             self.progress.emit(f"Downloading {self.model_name}...")
             
-            # Import here to avoid issues if faster-whisper isn't available
-            from faster_whisper import WhisperModel
+            # Imported here so a missing or broken faster-whisper install
+            # is reported as a failed download
+            WhisperModel = self._load_whisper_model()
             
             # This will trigger the download
             model = WhisperModel(self.model_name, device="cpu", compute_type="int8")
@@ -39,10 +132,105 @@ class ModelDownloadThread(QThread):
             self.finished.emit(False, f"Failed to download {self.model_name}: {str(e)}")
 
 
+class ModelDeleteThread(QThread):
+    """Thread for deleting a model folder so large models don't block the UI."""
+    finished = pyqtSignal(bool, str)  # success, message
+
+    def __init__(self, model_name, model_path):
+        super().__init__()
+        self.model_name = model_name
+        self.model_path = model_path
+
+    @staticmethod
+    def _ignore_missing(func, path, exc_info):
+        # Files can vanish mid-delete (e.g. a second delete or an external cleanup)
+        if not issubclass(exc_info[0], FileNotFoundError):
+            raise exc_info[1]
+
+    def run(self):
+        try:
+            shutil.rmtree(self.model_path, onerror=self._ignore_missing)
+            self.finished.emit(True, f"{self.model_name} has been deleted.")
+        except Exception as e:
+            self.finished.emit(False, f"Error deleting {self.model_name}: {str(e)}")
+
+
+class ModelTableModel(QAbstractTableModel):
+    """Table model holding one dict per Whisper model for the model manager."""
+
+    HEADERS = ["Model Name", "Size", "Status", "Location", "Select", "Download", "Delete"]
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._rows = []
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if orientation == Qt.Horizontal and role == Qt.DisplayRole:
+            return self.HEADERS[section]
+        return super().headerData(section, orientation, role)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+
+        row = self._rows[index.row()]
+        column = index.column()
+
+        if role == Qt.DisplayRole:
+            if column == 0:
+                return row['name']
+            if column == 1:
+                return f"{row['size']} MB"
+            if column == 2:
+                return "Downloaded" if row['downloaded'] else "Not Downloaded"
+            if column == 3:
+                return os.path.dirname(row['path']) if row['path'] else "N/A"
+        elif role == Qt.BackgroundRole and column == 2:
+            return QBrush(Qt.green if row['downloaded'] else Qt.lightGray)
+        return None
+
+    def flags(self, index):
+        return Qt.ItemIsEnabled | Qt.ItemIsSelectable
+
+    def update_row(self, i, **changes):
+        """Update fields of a single row and return the updated row."""
+        row = self._rows[i]
+        row.update(changes)
+        self.dataChanged.emit(self.index(i, 0), self.index(i, len(self.HEADERS) - 1))
+        return row
+
+    def set_rows(self, rows):
+        """Replace the row data, resetting the view only if the row count changed."""
+        if len(rows) != len(self._rows):
+            self.beginResetModel()
+            self._rows = rows
+            self.endResetModel()
+        else:
+            self._rows = rows
+            if rows:
+                self.dataChanged.emit(
+                    self.index(0, 0), self.index(len(rows) - 1, len(self.HEADERS) - 1)
+                )
+
+
 class ModelManagerWindow(BaseWindow):
+    # Last cache scan and the cache directory mtime it was taken at. Kept on
+    # the class because settings builds a new window every time it is opened.
+    _scan_result = None
+    _scan_mtime = None
+
     def __init__(self):
         super().__init__('Model Manager', 900, 600)
         self.download_threads = {}  # Keep track of download threads
+        self.delete_threads = {}  # Keep track of delete threads
+        self.row_buttons = {}  # model name -> (select, download, delete) buttons
+        self._refresh_pending = False
         self.init_ui()
         self.refresh_model_list()
         
@@ -61,11 +249,9 @@ class ModelManagerWindow(BaseWindow):
         self.main_layout.addWidget(desc_label)
         
         # Model table
-        self.model_table = QTableWidget()
-        self.model_table.setColumnCount(7)
-        self.model_table.setHorizontalHeaderLabels([
-            "Model Name", "Size", "Status", "Location", "Select", "Download", "Delete"
-        ])
+        self.table_model = ModelTableModel(self)
+        self.model_table = QTableView()
+        self.model_table.setModel(self.table_model)
         
         # Set column widths
         header = self.model_table.horizontalHeader()
@@ -104,31 +290,11 @@ class ModelManagerWindow(BaseWindow):
         
     def get_available_models(self):
         """Get list of available Whisper models."""
-        return [
-            "tiny", "tiny.en", "base", "base.en", "small", "small.en",
-            "medium", "medium.en", "large", "large-v1", "large-v2", "large-v3",
-            "large-v3-turbo", "distil-large-v2", "distil-large-v3"
-        ]
+        return _AVAILABLE_MODELS
     
     def get_model_sizes(self):
         """Get approximate sizes for models in MB."""
-        return {
-            "tiny": 39,
-            "tiny.en": 39,
-            "base": 74,
-            "base.en": 74,
-            "small": 244,
-            "small.en": 244,
-            "medium": 769,
-            "medium.en": 769,
-            "large": 1550,
-            "large-v1": 1550,
-            "large-v2": 1550,
-            "large-v3": 1550,
-            "large-v3-turbo": 1620,
-            "distil-large-v2": 775,
-            "distil-large-v3": 775
-        }
+        return _MODEL_SIZES
     
     def get_models_directory(self):
         """Get the directory where models are stored."""
@@ -137,129 +303,179 @@ class ModelManagerWindow(BaseWindow):
         cache_dir = os.path.join(home_dir, ".cache", "huggingface", "hub")
         return cache_dir
     
+    def get_model_folder_patterns(self):
+        """Map model names to their folder names in the HuggingFace cache."""
+        return _FOLDER_PATTERNS
+
     def is_model_downloaded(self, model_name):
         """Check if a model is downloaded."""
         cache_dir = self.get_models_directory()
-        
-        # Map model names to their folder patterns
-        model_folder_patterns = {
-            "tiny": "models--Systran--faster-whisper-tiny",
-            "tiny.en": "models--Systran--faster-whisper-tiny.en",
-            "base": "models--Systran--faster-whisper-base",
-            "base.en": "models--Systran--faster-whisper-base.en",
-            "small": "models--Systran--faster-whisper-small",
-            "small.en": "models--Systran--faster-whisper-small.en",
-            "medium": "models--Systran--faster-whisper-medium",
-            "medium.en": "models--Systran--faster-whisper-medium.en",
-            "large": "models--Systran--faster-whisper-large",
-            "large-v1": "models--Systran--faster-whisper-large-v1",
-            "large-v2": "models--Systran--faster-whisper-large-v2",
-            "large-v3": "models--Systran--faster-whisper-large-v3",
-            "large-v3-turbo": "models--mobiuslabsgmbh--faster-whisper-large-v3-turbo",
-            "distil-large-v2": "models--Systran--faster-distil-whisper-large-v2",
-            "distil-large-v3": "models--Systran--faster-distil-whisper-large-v3"
-        }
-        
-        folder_pattern = model_folder_patterns.get(model_name)
+        folder_pattern = _FOLDER_PATTERNS.get(model_name)
         if not folder_pattern:
             return False, None
         
-        # Look for the specific folder pattern
-        for item in os.listdir(cache_dir):
-            item_path = os.path.join(cache_dir, item)
-            if os.path.isdir(item_path) and folder_pattern in item:
-                # Check if the folder contains model files
-                for root, dirs, files in os.walk(item_path):
-                    for file in files:
-                        if file.endswith('.bin') or file.endswith('.safetensors'):
-                            return True, item_path
-                break
+        # Hub folder names are deterministic, so probe the folder directly
+        model_path = os.path.join(cache_dir, folder_pattern)
+        if not os.path.isdir(model_path):
+            return False, None
         
+        if _has_model_file(model_path):
+            return True, model_path
         return False, None
     
     def get_model_folder_size(self, model_path):
         """Get the size of a model folder in MB."""
-        if not model_path or not os.path.exists(model_path):
+        if not model_path:
             return 0
         
-        total_size = 0
-        for dirpath, dirnames, filenames in os.walk(model_path):
-            for filename in filenames:
-                filepath = os.path.join(dirpath, filename)
-                if os.path.exists(filepath):
-                    total_size += os.path.getsize(filepath)
-        
+        # A missing folder fails the first scandir inside _dir_size and sizes as 0
+        total_size = _dir_size(model_path)
         return round(total_size / (1024 * 1024), 1)  # Convert to MB
-    
+
+    def _scan_cache(self):
+        """
+        Scan the model cache once for all known models.
+
+        Returns {model_name: (is_downloaded, model_path)}, the same pair
+        is_model_downloaded returns.
+        """
+        try:
+            with os.scandir(self.get_models_directory()) as it:
+                dirs_by_name = {entry.name: entry.path for entry in it if entry.is_dir()}
+        except OSError:
+            dirs_by_name = {}
+
+        patterns = self.get_model_folder_patterns()
+        scan = {}
+        for model_name in self.get_available_models():
+            model_path = dirs_by_name.get(patterns.get(model_name))
+            if model_path and _has_model_file(model_path):
+                scan[model_name] = (True, model_path)
+            else:
+                scan[model_name] = (False, None)
+        return scan
+
+    def _cached_scan(self):
+        """
+        Return the last cache scan if the cache directory hasn't changed since.
+
+        The directory mtime changes whenever a model folder is added or
+        removed. Changes inside a model folder don't touch it, so callers
+        that know the contents changed call invalidate_scan() first.
+        """
+        try:
+            mtime = os.stat(self.get_models_directory()).st_mtime_ns
+        except OSError:
+            mtime = None
+        cls = type(self)
+        if cls._scan_result is None or mtime != cls._scan_mtime:
+            cls._scan_result = self._scan_cache()
+            cls._scan_mtime = mtime
+        return cls._scan_result
+
+    def invalidate_scan(self):
+        """Force the next refresh to rescan the model cache."""
+        type(self)._scan_result = None
+
     def refresh_model_list(self):
         """Refresh the model list table."""
-        self.model_table.setRowCount(0)
         models = self.get_available_models()
         sizes = self.get_model_sizes()
         
         # Get currently selected model
         current_model = ConfigManager.get_config_value('model_options', 'local', 'model')
+        scan = self._cached_scan()
         
-        for i, model_name in enumerate(models):
-            self.model_table.insertRow(i)
-            
-            # Model name
-            name_item = QTableWidgetItem(model_name)
-            name_item.setFlags(name_item.flags() & ~Qt.ItemIsEditable)
-            self.model_table.setItem(i, 0, name_item)
-            
-            # Size
-            size_mb = sizes.get(model_name, "Unknown")
-            size_item = QTableWidgetItem(f"{size_mb} MB")
-            size_item.setFlags(size_item.flags() & ~Qt.ItemIsEditable)
-            self.model_table.setItem(i, 1, size_item)
-            
-            # Status
-            is_downloaded, model_path = self.is_model_downloaded(model_name)
-            if is_downloaded:
-                status_item = QTableWidgetItem("Downloaded")
-                status_item.setBackground(Qt.green)
-            else:
-                status_item = QTableWidgetItem("Not Downloaded")
-                status_item.setBackground(Qt.lightGray)
-            status_item.setFlags(status_item.flags() & ~Qt.ItemIsEditable)
-            self.model_table.setItem(i, 2, status_item)
-            
-            # Location
-            if model_path:
-                location_item = QTableWidgetItem(os.path.dirname(model_path))
-            else:
-                location_item = QTableWidgetItem("N/A")
-            location_item.setFlags(location_item.flags() & ~Qt.ItemIsEditable)
-            self.model_table.setItem(i, 3, location_item)
-            
-            # Select button
-            if is_downloaded:
-                if model_name == current_model:
-                    select_btn = QPushButton("✓ Selected")
-                    select_btn.setStyleSheet("background-color: #4CAF50; color: white; font-weight: bold;")
-                else:
-                    select_btn = QPushButton("Select")
-                    select_btn.setStyleSheet("background-color: #2196F3; color: white;")
+        rows = []
+        for model_name in models:
+            is_downloaded, model_path = scan[model_name]
+            rows.append({
+                'name': model_name,
+                'size': sizes.get(model_name, "Unknown"),
+                'downloaded': is_downloaded,
+                'path': model_path,
+                'selected': model_name == current_model,
+            })
+        self.table_model.set_rows(rows)
+        
+        for i, row in enumerate(rows):
+            self.update_row_buttons(i, row)
+    
+    def _update_row(self, model_name, **changes):
+        """Update one model's row and its buttons without rescanning the cache."""
+        models = self.get_available_models()
+        if model_name not in models:
+            return
+        i = models.index(model_name)
+        row = self.table_model.update_row(i, **changes)
+        self.update_row_buttons(i, row)
+    
+    def _request_refresh(self):
+        """Schedule a table refresh, coalescing requests made in the same event loop pass."""
+        if not self._refresh_pending:
+            self._refresh_pending = True
+            QTimer.singleShot(0, self._do_refresh)
+    
+    def _do_refresh(self):
+        self._refresh_pending = False
+        self.refresh_model_list()
+    
+    def update_row_buttons(self, i, row):
+        """Create the action buttons for a row on first use, then sync their state."""
+        model_name = row['name']
+        buttons = self.row_buttons.get(model_name)
+        if buttons is None:
+            buttons = (QPushButton(), QPushButton(), QPushButton("Delete"))
+            select_btn, download_btn, delete_btn = buttons
+            select_btn.clicked.connect(self._on_select_clicked)
+            download_btn.clicked.connect(self._on_download_clicked)
+            delete_btn.clicked.connect(self._on_delete_clicked)
+            for column, btn in enumerate(buttons, start=4):
+                btn.setProperty('model_name', model_name)
+                self.model_table.setIndexWidget(self.table_model.index(i, column), btn)
+            self.row_buttons[model_name] = buttons
+        select_btn, download_btn, delete_btn = buttons
+        
+        # Select button
+        if row['downloaded']:
+            if row['selected']:
+                select_btn.setText("✓ Selected")
+                select_btn.setStyleSheet("background-color: #4CAF50; color: white; font-weight: bold;")
             else:
-                select_btn = QPushButton("Select")
-                select_btn.setEnabled(False)
-                select_btn.setStyleSheet("background-color: #cccccc; color: #666666;")
-            
-            select_btn.clicked.connect(lambda checked, name=model_name: self.select_model(name))
-            self.model_table.setCellWidget(i, 4, select_btn)
-            
-            # Download button
-            download_btn = QPushButton("Download" if not is_downloaded else "Re-download")
-            download_btn.clicked.connect(lambda checked, name=model_name: self.download_model(name))
-            self.model_table.setCellWidget(i, 5, download_btn)
-            
-            # Delete button
-            delete_btn = QPushButton("Delete")
-            delete_btn.setEnabled(is_downloaded)
-            delete_btn.clicked.connect(lambda checked, name=model_name: self.delete_model(name))
-            self.model_table.setCellWidget(i, 6, delete_btn)
+                select_btn.setText("Select")
+                select_btn.setStyleSheet("background-color: #2196F3; color: white;")
+        else:
+            select_btn.setText("Select")
+            select_btn.setStyleSheet("background-color: #cccccc; color: #666666;")
+        select_btn.setEnabled(row['downloaded'])
+        
+        # Download button
+        thread = self.download_threads.get(model_name)
+        if thread and thread.isRunning():
+            download_btn.setText("Downloading...")
+            download_btn.setEnabled(False)
+        else:
+            download_btn.setText("Re-download" if row['downloaded'] else "Download")
+            download_btn.setEnabled(True)
+        
+        # Delete button
+        thread = self.delete_threads.get(model_name)
+        if thread and thread.isRunning():
+            delete_btn.setText("Deleting...")
+            delete_btn.setEnabled(False)
+        else:
+            delete_btn.setText("Delete")
+            delete_btn.setEnabled(row['downloaded'])
     
+    def _on_select_clicked(self):
+        self.select_model(self.sender().property('model_name'))
+
+    def _on_download_clicked(self):
+        self.download_model(self.sender().property('model_name'))
+
+    def _on_delete_clicked(self):
+        self.delete_model(self.sender().property('model_name'))
+
     def download_model(self, model_name):
         """Download a model."""
         if model_name in self.download_threads and self.download_threads[model_name].isRunning():
@@ -281,12 +497,10 @@ class ModelManagerWindow(BaseWindow):
             download_thread.start()
             
             # Update button to show progress
-            for i in range(self.model_table.rowCount()):
-                if self.model_table.item(i, 0).text() == model_name:
-                    progress_btn = QPushButton("Downloading...")
-                    progress_btn.setEnabled(False)
-                    self.model_table.setCellWidget(i, 5, progress_btn)
-                    break
+            if model_name in self.row_buttons:
+                download_btn = self.row_buttons[model_name][1]
+                download_btn.setText("Downloading...")
+                download_btn.setEnabled(False)
     
     def update_download_progress(self, model_name, message):
         """Update download progress message."""
@@ -295,6 +509,7 @@ class ModelManagerWindow(BaseWindow):
     
     def select_model(self, model_name):
         """Select a model for use."""
+        old_model = ConfigManager.get_config_value('model_options', 'local', 'model')
         ConfigManager.set_config_value(model_name, 'model_options', 'local', 'model')
         ConfigManager.save_config()
         
@@ -302,8 +517,9 @@ class ModelManagerWindow(BaseWindow):
                               f"{model_name} has been selected as the active model.\n\n"
                               "The change will take effect when you restart Screamscriber.")
         
-        # Refresh the table to update the selection indicators
-        self.refresh_model_list()
+        # Only the old and new selection change, so skip the full cache rescan
+        self._update_row(old_model, selected=False)
+        self._update_row(model_name, selected=True)
 
     def download_finished(self, model_name, success, message):
         """Handle download completion."""
@@ -318,7 +534,8 @@ class ModelManagerWindow(BaseWindow):
             del self.download_threads[model_name]
         
         # Refresh the table
-        self.refresh_model_list()
+        self.invalidate_scan()
+        self._request_refresh()
     
     def delete_model(self, model_name):
         """Delete a downloaded model."""
@@ -333,17 +550,37 @@ class ModelManagerWindow(BaseWindow):
                                    QMessageBox.Yes | QMessageBox.No, QMessageBox.No)
         
         if reply == QMessageBox.Yes:
-            try:
-                # Delete the model directory directly
-                if model_path and os.path.exists(model_path):
-                    shutil.rmtree(model_path)
-                    QMessageBox.information(self, "Model Deleted", f"{model_name} has been deleted.")
-                    self.refresh_model_list()
-                else:
-                    QMessageBox.warning(self, "Delete Failed", f"Could not find {model_name} to delete.")
-                
-            except Exception as e:
-                QMessageBox.critical(self, "Delete Error", f"Error deleting {model_name}: {str(e)}")
+            if model_name in self.delete_threads and self.delete_threads[model_name].isRunning():
+                return
+            
+            # Delete the model directory in the background
+            delete_thread = ModelDeleteThread(model_name, model_path)
+            delete_thread.finished.connect(lambda success, msg: self.delete_finished(model_name, success, msg))
+            
+            self.delete_threads[model_name] = delete_thread
+            delete_thread.start()
+            
+            # Update button to show progress
+            if model_name in self.row_buttons:
+                delete_btn = self.row_buttons[model_name][2]
+                delete_btn.setText("Deleting...")
+                delete_btn.setEnabled(False)
+    
+    def delete_finished(self, model_name, success, message):
+        """Handle delete completion."""
+        if success:
+            QMessageBox.information(self, "Model Deleted", message)
+        else:
+            QMessageBox.critical(self, "Delete Error", message)
+        
+        # Clean up thread
+        if model_name in self.delete_threads:
+            self.delete_threads[model_name].deleteLater()
+            del self.delete_threads[model_name]
+        
+        # Refresh the table
+        self.invalidate_scan()
+        self._request_refresh()
     
     def open_models_folder(self):
         """Open the models folder in file manager."""
@@ -1,7 +1,9 @@
 import sys
 import os
+import math
+import numpy as np
 from PyQt5.QtCore import Qt, QRectF, pyqtSignal, pyqtSlot, QTimer, QObject
-from PyQt5.QtGui import QFont, QPixmap, QIcon, QPainter, QBrush, QColor, QPainterPath, QCursor
+from PyQt5.QtGui import QFont, QPixmap, QPixmapCache, QIcon, QPainter, QBrush, QColor, QPainterPath, QCursor
 from PyQt5.QtWidgets import QApplication, QLabel, QHBoxLayout, QWidget
 
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
@@ -9,7 +11,12 @@ from ui.base_window import BaseWindow
 
 
 class SpectrumData(QObject):
-    """Holds spectrum level data with smooth decay. No painting — the window draws it."""
+    """
+    Holds spectrum level data with smooth decay. No painting — the window draws it.
+
+    updated is only emitted from the timer tick, so the window repaints at
+    most once per tick however fast audio levels arrive.
+    """
 
     NUM_BANDS = 200
     DECAY_RATE = 0.06
@@ -18,12 +25,15 @@ class SpectrumData(QObject):
 
     def __init__(self, parent=None):
         super().__init__(parent)
-        self._levels = [0.0] * self.NUM_BANDS
-        self._display = [0.0] * self.NUM_BANDS
+        self._levels = np.zeros(self.NUM_BANDS, dtype=np.float32)
+        self._display = np.zeros_like(self._levels)
         self._active = False
+        # Display changed since the last updated signal
+        self._dirty = False
 
         self._timer = QTimer(self)
-        self._timer.setInterval(30)
+        self._timer.setTimerType(Qt.PreciseTimer)
+        self._timer.setInterval(33)
         self._timer.timeout.connect(self._decay_tick)
 
     @property
@@ -35,29 +45,32 @@ class SpectrumData(QObject):
         return self._display
 
     def set_levels(self, levels):
-        for i in range(min(len(levels), self.NUM_BANDS)):
-            self._levels[i] = levels[i]
-            if levels[i] > self._display[i]:
-                self._display[i] = levels[i]
+        arr = np.asarray(levels, dtype=np.float32)[:self.NUM_BANDS]
+        n = arr.size
+        self._levels[:n] = arr
+        # Only bars that rise change what is drawn; falling ones decay on the timer
+        if (arr > self._display[:n]).any():
+            np.maximum(self._display[:n], arr, out=self._display[:n])
+            self._dirty = True
         if not self._timer.isActive():
             self._timer.start()
         self._active = True
-        self.updated.emit()
 
     def reset(self):
-        self._levels = [0.0] * self.NUM_BANDS
-        self._display = [0.0] * self.NUM_BANDS
+        self._levels.fill(0.0)
+        self._display.fill(0.0)
         self._active = False
+        self._dirty = False
         self._timer.stop()
         self.updated.emit()
 
     def _decay_tick(self):
-        changed = False
-        for i in range(self.NUM_BANDS):
-            if self._display[i] > self._levels[i]:
-                self._display[i] = max(self._levels[i], self._display[i] - self.DECAY_RATE)
-                changed = True
-        if changed:
+        new = np.maximum(self._levels, self._display - self.DECAY_RATE)
+        if not np.array_equal(new, self._display):
+            self._display = new
+            self._dirty = True
+        if self._dirty:
+            self._dirty = False
             self.updated.emit()
         else:
             self._timer.stop()
@@ -67,13 +80,35 @@ class StatusWindow(BaseWindow):
     statusSignal = pyqtSignal(str)
     closeSignal = pyqtSignal()
 
+    @staticmethod
+    def _get_icon(name, dpr):
+        """
+        Load assets/<name>.png scaled to 32x32 logical pixels at the given DPR.
+
+        Scaled icons are kept in Qt's global QPixmapCache, so later windows
+        skip the disk load and smooth scale.
+        """
+        key = f'ss:{name}:32@{dpr}'
+        pixmap = QPixmapCache.find(key)
+        if pixmap is None:
+            size = round(32 * dpr)
+            pixmap = QPixmap(os.path.join('assets', f'{name}.png')).scaled(
+                size, size, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+            pixmap.setDevicePixelRatio(dpr)
+            QPixmapCache.insert(key, pixmap)
+        return pixmap
+
     def __init__(self):
         """
         Initialize the status window.
         """
         super().__init__('Screamscriber Status', 320, 180)
         self.spectrum = SpectrumData(self)
-        self.spectrum.updated.connect(self.update)
+        self.spectrum.updated.connect(self._on_spectrum_updated)
+        # Top edge of the tallest bar drawn so far, in window coordinates
+        self._bars_top = self.height()
+        self._build_bg()
+        self._layout_bars()
         self.initStatusUI()
         self.statusSignal.connect(self.updateStatus)
 
@@ -89,10 +124,9 @@ class StatusWindow(BaseWindow):
 
         self.icon_label = QLabel()
         self.icon_label.setFixedSize(32, 32)
-        microphone_path = os.path.join('assets', 'microphone.png')
-        pencil_path = os.path.join('assets', 'pencil.png')
-        self.microphone_pixmap = QPixmap(microphone_path).scaled(32, 32, Qt.KeepAspectRatio, Qt.SmoothTransformation)
-        self.pencil_pixmap = QPixmap(pencil_path).scaled(32, 32, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+        dpr = self.devicePixelRatioF()
+        self.microphone_pixmap = self._get_icon('microphone', dpr)
+        self.pencil_pixmap = self._get_icon('pencil', dpr)
         self.icon_label.setPixmap(self.microphone_pixmap)
         self.icon_label.setAlignment(Qt.AlignCenter)
 
@@ -141,38 +175,84 @@ class StatusWindow(BaseWindow):
         else:
             super().keyPressEvent(event)
 
+    def _build_bg(self):
+        """
+        Render the rounded white background into a pixmap for the current size.
+        """
+        self._bg_path = QPainterPath()
+        self._bg_path.addRoundedRect(QRectF(self.rect()), 20, 20)
+
+        dpr = self.devicePixelRatioF()
+        self._bg_pixmap = QPixmap(self.size() * dpr)
+        self._bg_pixmap.setDevicePixelRatio(dpr)
+        self._bg_pixmap.fill(Qt.transparent)
+
+        painter = QPainter(self._bg_pixmap)
+        painter.setRenderHint(QPainter.Antialiasing)
+        painter.setBrush(QBrush(QColor(255, 255, 255, 255)))
+        painter.setPen(Qt.NoPen)
+        painter.drawPath(self._bg_path)
+        painter.end()
+
+    def _layout_bars(self):
+        """
+        Precompute bar x positions and scratch arrays for the current width.
+        """
+        n = SpectrumData.NUM_BANDS
+        self._bar_w = self.width() / n
+        self._xs = np.arange(n) * self._bar_w
+        self._heights = np.empty(n, dtype=np.float32)
+        self._ys = np.empty(n, dtype=np.float32)
+
+    def resizeEvent(self, event):
+        self._build_bg()
+        self._layout_bars()
+        super().resizeEvent(event)
+
     def paintEvent(self, event):
         painter = QPainter(self)
         painter.setRenderHint(QPainter.Antialiasing)
 
-        # Draw rounded white background
-        path = QPainterPath()
-        path.addRoundedRect(QRectF(self.rect()), 20, 20)
-        painter.setBrush(QBrush(QColor(255, 255, 255, 255)))
-        painter.setPen(Qt.NoPen)
-        painter.drawPath(path)
+        # Blit the pre-rendered rounded background
+        painter.drawPixmap(0, 0, self._bg_pixmap)
 
         # Draw spectrum bars over the full window, clipped to rounded rect
         if self.spectrum.active:
-            painter.setClipPath(path)
+            painter.setClipPath(self._bg_path)
             painter.setBrush(QColor(0, 0, 0))
             painter.setPen(Qt.NoPen)
 
-            w = self.width()
             h = self.height()
-            n = SpectrumData.NUM_BANDS
-            bar_w = w / n
-            display = self.spectrum.display
-
-            for i in range(n):
-                bar_h = display[i] * h
-                if bar_h < 1:
-                    continue
-                x = i * bar_w
-                painter.drawRect(QRectF(x, h - bar_h, bar_w, bar_h))
+            xs = self._xs
+            bar_w = self._bar_w
+            heights = np.multiply(self.spectrum.display, h, out=self._heights)
+            ys = np.subtract(h, heights, out=self._ys)
+
+            # Submit every visible bar in a single call
+            rects = [
+                QRectF(float(xs[i]), float(ys[i]), bar_w, float(heights[i]))
+                for i in np.flatnonzero(heights >= 1)
+            ]
+            if rects:
+                painter.drawRects(rects)
 
         painter.end()
 
+    def _on_spectrum_updated(self):
+        """
+        Repaint only the strip of the window that old or new bars cover.
+        """
+        w = self.width()
+        h = self.height()
+        top = h
+        if self.spectrum.active:
+            # One extra pixel for the antialiased bar edges
+            top = h - math.ceil(float(self.spectrum.display.max()) * h) - 1
+        dirty_top = max(min(top, self._bars_top), 0)
+        self._bars_top = top
+        if dirty_top < h:
+            self.update(0, dirty_top, w, h - dirty_top)
+
     @pyqtSlot(list)
     def updateAudioLevel(self, levels):
         """